@@ -1,26 +1,38 @@
 
 import streamlit as st
-import json
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import orjson
 import io
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 import base64
 import tempfile
 import os
-import PyPDF2
+import hashlib
+import re
+import threading
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import Future, ThreadPoolExecutor
+import pymupdf
 import docx
+import numpy as np
 import pandas as pd
+from PIL import Image as PILImage, ImageDraw, ImageFont
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image
 from reportlab.lib.colors import HexColor, black, white
 from reportlab.pdfgen import canvas
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.platypus.tableofcontents import TableOfContents
 import google.generativeai as genai
+import google.ai.generativelanguage as glm
 
 # ============================================================================
 # CONFIGURATION & SETUP
@@ -32,6 +44,13 @@ st.set_page_config(
     layout="wide"
 )
 
+MAX_CONTENT_CHARS = 3000  # Document characters that reach the Gemini prompt
+CSV_SAMPLE_ROWS = 10_000  # Rows read from an uploaded CSV to build its summary
+IMAGE_STREAM_THRESHOLD = 1024 * 1024  # Images larger than this are written to disk in chunks
+PLACEHOLDER_MAX_SIDE = 1200  # Pixel cap for locally rendered placeholders (drawn at most 3x2 in)
+EMBEDDING_MODEL = "models/text-embedding-004"
+SEMANTIC_CACHE_THRESHOLD = 0.92  # Cosine similarity above which a previous topic is reused
+
 # ============================================================================
 # DATA MODELS
 # ============================================================================
@@ -64,25 +83,30 @@ class DocumentProcessor:
     """Handle various document formats and extract text content"""
     
     @staticmethod
-    def extract_text_from_pdf(file) -> str:
+    def extract_text_from_pdf(file, max_chars: Optional[int] = None) -> str:
+        pdf_doc = None
         try:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            pdf_doc = pymupdf.open(stream=file.read(), filetype="pdf")
+            buffer = io.StringIO()
+            for page in pdf_doc:
+                buffer.write(page.get_text("text"))
+                buffer.write("\n")
+                # Stop parsing pages once enough text has been collected
+                if max_chars is not None and buffer.tell() > max_chars:
+                    break
+            return buffer.getvalue().strip()
         except Exception as e:
             st.error(f"Error reading PDF: {str(e)}")
             return ""
+        finally:
+            if pdf_doc is not None:
+                pdf_doc.close()
 
     @staticmethod  
     def extract_text_from_docx(file) -> str:
         try:
             doc = docx.Document(file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
         except Exception as e:
             st.error(f"Error reading DOCX: {str(e)}")
             return ""
@@ -98,13 +122,25 @@ class DocumentProcessor:
     @staticmethod
     def extract_text_from_csv(file) -> str:
         try:
-            df = pd.read_csv(file)
-            summary = f"Dataset Summary:\n"
-            summary += f"Shape: {df.shape[0]} rows, {df.shape[1]} columns\n"
-            summary += f"Columns: {', '.join(df.columns.tolist())}\n\n"
-            summary += "Data Overview:\n"
-            summary += df.describe(include='all').to_string()
-            return summary
+            # One extra row tells a file of exactly CSV_SAMPLE_ROWS rows apart from a longer one
+            df = pd.read_csv(file, nrows=CSV_SAMPLE_ROWS + 1)
+            sampled = len(df) > CSV_SAMPLE_ROWS
+            df = df.iloc[:CSV_SAMPLE_ROWS]
+            rows = f"{len(df)}+ (sampled)" if sampled else str(len(df))
+            lines = [
+                "Dataset Summary:",
+                f"Shape: {rows} rows, {df.shape[1]} columns",
+                f"Columns: {', '.join(f'{col} ({dtype})' for col, dtype in df.dtypes.items())}"
+            ]
+            
+            # Numeric stats come before the sample rows so they survive the MAX_CONTENT_CHARS cut;
+            # only numeric columns are described since include='all' is slow on wide text data
+            numeric = df.select_dtypes("number")
+            if not numeric.empty:
+                lines += ["", "Numeric Overview:", numeric.describe().to_string()]
+            
+            lines += ["", "Sample Rows:", df.head(5).to_string()]
+            return "\n".join(lines)
         except Exception as e:
             st.error(f"Error reading CSV: {str(e)}")
             return ""
@@ -116,33 +152,55 @@ class DocumentProcessor:
         file_type = uploaded_file.type
         
         if file_type == "application/pdf":
-            return self.extract_text_from_pdf(uploaded_file)
+            text = self.extract_text_from_pdf(uploaded_file, max_chars=MAX_CONTENT_CHARS)
         elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            return self.extract_text_from_docx(uploaded_file)
+            text = self.extract_text_from_docx(uploaded_file)
         elif file_type == "text/plain":
-            return self.extract_text_from_txt(uploaded_file)
+            text = self.extract_text_from_txt(uploaded_file)
         elif file_type == "text/csv":
-            return self.extract_text_from_csv(uploaded_file)
+            text = self.extract_text_from_csv(uploaded_file)
         else:
             st.error(f"Unsupported file type: {file_type}")
             return ""
+        
+        # Only the prompt-sized prefix is kept, so reruns never carry the full document
+        return text[:MAX_CONTENT_CHARS]
+
+    def process_many(self, uploaded_files) -> str:
+        """Extract text from several uploaded files in parallel and join the results"""
+        if not uploaded_files:
+            return ""
+        
+        ctx = get_script_run_ctx()
+        
+        def process(uploaded_file) -> str:
+            add_script_run_ctx(threading.current_thread(), ctx)  # Lets st.error report from worker threads
+            return self.process_uploaded_file(uploaded_file)
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(uploaded_files))) as executor:
+            results = list(executor.map(process, uploaded_files))
+        
+        texts = [text for text in results if text]
+        if not texts:
+            return ""
+        
+        # Split the prompt budget fairly: shorter files go first and pass their unused share on
+        separator = "\n\n---\n\n"
+        budget = MAX_CONTENT_CHARS - len(separator) * (len(texts) - 1)
+        limits = [0] * len(texts)
+        by_length = sorted(range(len(texts)), key=lambda idx: len(texts[idx]))
+        for position, idx in enumerate(by_length):
+            limits[idx] = min(len(texts[idx]), budget // (len(texts) - position))
+            budget -= limits[idx]
+        
+        return separator.join(text[:limit] for text, limit in zip(texts, limits))
 
 # ============================================================================
 # AI CONTENT GENERATION MODULE
 # ============================================================================
 
-class AIContentGenerator:
-    """Generate presentation content using Google Gemini"""
-    
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        if api_key:
-            genai.configure(api_key=api_key)
-        
-    def create_presentation_prompt(self, topic: str, document_content: str = "") -> str:
-        """Create the system prompt for enhanced presentation generation"""
-        
-        base_prompt = """You are an intelligent assistant that helps generate professional PDF presentations with rich content.
+# Static part of the generation prompt; only the topic and document vary per call
+_BASE_PROMPT = """You are an intelligent assistant that helps generate professional PDF presentations with rich content.
 
 Your task is to generate comprehensive presentation-ready slide content with additional information, relevant image suggestions, and reference URLs.
 
@@ -179,35 +237,52 @@ Output Format - Respond ONLY with valid JSON in this exact structure:
 }
 ```
 """
+
+# JSON object inside a ```json fence; otherwise the outermost {...} in the response
+_FENCED_JSON_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.S)
+_BARE_JSON_RE = re.compile(r"\{.*\}", re.S)
+
+class AIContentGenerator:
+    """Generate presentation content using Google Gemini"""
+    
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        # A client bound to this key rather than genai.configure, which is process-wide
+        # and would let concurrent sessions with different keys send requests under each other's key
+        self._client = glm.GenerativeServiceClient(client_options={"api_key": api_key}) if api_key else None
+        self._model = genai.GenerativeModel('gemini-2.0-flash')
+        self._model._client = self._client
         
+    def create_presentation_prompt(self, topic: str, document_content: str = "") -> str:
+        """Create the system prompt for enhanced presentation generation"""
         if document_content:
-            content_preview = document_content[:3000] + "..." if len(document_content) > 3000 else document_content
-            prompt = f"{base_prompt}\n\nDocument Content to Analyze:\n{content_preview}\n\nTopic: {topic}"
-        else:
-            prompt = f"{base_prompt}\n\nTopic to Present: {topic}\n\nGenerate comprehensive content based on your knowledge with relevant examples, statistics, and references."
-            
-        return prompt
+            return f"{_BASE_PROMPT}\n\nDocument Content to Analyze:\n{document_content}\n\nTopic: {topic}"
+        return f"{_BASE_PROMPT}\n\nTopic to Present: {topic}\n\nGenerate comprehensive content based on your knowledge with relevant examples, statistics, and references."
+
+    @staticmethod
+    def _prompt_cache_key(prompt: str) -> str:
+        """Key of a prompt in the session's exact-match Gemini cache"""
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
 
     def generate_with_gemini(self, prompt: str) -> Optional[Dict]:
         """Generate content using Google Gemini"""
+        # Identical prompts (same topic and document) reuse the parsed response from this session
+        cache = st.session_state.setdefault('_gemini_cache', {})
+        cache_key = self._prompt_cache_key(prompt)
+        if cache_key in cache:
+            return cache[cache_key]
+        
         try:
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
-            
-            response_text = response.text.strip()
-            
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.rfind("```")
-                if json_end > json_start:
-                    response_text = response_text[json_start:json_end].strip()
+            response_text = self._stream_response(prompt).strip()
+            # A fenced block wins even if prose before it contains braces
+            fenced = _FENCED_JSON_RE.search(response_text)
+            match = fenced or _BARE_JSON_RE.search(response_text)
             
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                return json.loads(json_str)
+            if match:
+                json_str = fenced.group(1) if fenced else match.group(0)
+                result = orjson.loads(json_str)
+                cache[cache_key] = result
+                return result
             else:
                 st.error("Could not parse JSON from AI response")
                 return None
@@ -216,6 +291,61 @@ Output Format - Respond ONLY with valid JSON in this exact structure:
             st.error(f"Error generating content with Gemini: {str(e)}")
             return None
 
+    def _stream_response(self, prompt: str) -> str:
+        """Stream the Gemini response, listing each slide's title as soon as its JSON object closes"""
+        response = self._model.generate_content(prompt, stream=True)
+        progress = st.empty()
+        
+        chunks = []
+        slide_titles = []
+        slide_chars = []  # Characters of the slide object currently being received
+        depth = 0
+        in_string = False
+        escaped = False
+        
+        for chunk in response:
+            text = chunk.text
+            chunks.append(text)
+            
+            # Brace depth outside JSON strings: slides are the objects opened at depth 1
+            for char in text:
+                if depth >= 2:
+                    slide_chars.append(char)
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == "\\":
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char == '{':
+                    depth += 1
+                    if depth == 2:
+                        slide_chars = [char]
+                elif char == '}':
+                    depth -= 1
+                    if depth == 1:
+                        slide_titles.append(self._streamed_slide_title("".join(slide_chars), len(slide_titles)))
+            
+            if slide_titles:
+                progress.markdown("**📝 Slides received so far:**\n\n" + "\n".join(
+                    f"{number}. {title}" for number, title in enumerate(slide_titles, start=1)
+                ))
+        
+        progress.empty()
+        return "".join(chunks)
+
+    @staticmethod
+    def _streamed_slide_title(slide_json: str, index: int) -> str:
+        """Title of a completed slide object from the stream, with a numbered fallback"""
+        try:
+            title = orjson.loads(slide_json).get('title', '')
+        except (orjson.JSONDecodeError, AttributeError):
+            title = ''
+        return title or f"Slide {index + 1}"
+
     def generate_presentation_content(self, topic: str, document_content: str = "") -> Optional[PresentationData]:
         """Main method to generate enhanced presentation content"""
         
@@ -224,6 +354,19 @@ Output Format - Respond ONLY with valid JSON in this exact structure:
             return self._generate_fallback_content(topic)
         
         prompt = self.create_presentation_prompt(topic, document_content)
+        topic_embedding = None
+        document_key = hashlib.sha256(document_content.encode("utf-8")).hexdigest()
+        
+        # An identical prompt answered earlier is served by generate_with_gemini's cache without any API call
+        if self._prompt_cache_key(prompt) not in st.session_state.get('_gemini_cache', {}):
+            # Otherwise reuse a presentation generated for a reworded but equivalent topic on the same
+            # document; the embedding must finish before generation so a hit can skip the Gemini call
+            topic_embedding = self._embed_topic(topic)
+            cached = self._semantic_cache_lookup(topic_embedding, document_key)
+            if cached:
+                st.info(f"♻️ Reusing the presentation generated for a similar topic: \"{cached.topic}\"")
+                return replace(cached, topic=topic)
+        
         result = self.generate_with_gemini(prompt)
         
         if not result:
@@ -240,16 +383,61 @@ Output Format - Respond ONLY with valid JSON in this exact structure:
                     reference_urls=slide_data.get('reference_urls', [])
                 ))
             
-            return PresentationData(
+            presentation = PresentationData(
                 slides=slides,
                 topic=topic,
                 generated_at=datetime.now()
             )
+            self._semantic_cache_store(topic_embedding, document_key, presentation)
+            return presentation
             
         except Exception as e:
             st.error(f"Error parsing AI response: {str(e)}")
             return self._generate_fallback_content(topic)
 
+    def _embed_topic(self, topic: str) -> Optional[np.ndarray]:
+        """Embed the topic as a unit vector for semantic cache lookups"""
+        try:
+            result = genai.embed_content(
+                model=EMBEDDING_MODEL, content=topic, task_type="semantic_similarity", client=self._client
+            )
+            embedding = np.asarray(result['embedding'], dtype=np.float32)
+            return embedding / np.linalg.norm(embedding)
+        except Exception as e:
+            print(f"Error embedding topic {topic!r}: {e}")
+            return None
+
+    def _semantic_cache_lookup(self, embedding: Optional[np.ndarray], document_key: str) -> Optional[PresentationData]:
+        """Return the cached presentation most similar to the topic, if it clears the threshold"""
+        cache = st.session_state.get('_semantic_cache')
+        if embedding is None or not cache or not cache['presentations']:
+            return None
+        
+        # Embeddings are unit-normalised, so one matrix-vector product gives every cosine similarity
+        similarities = cache['embeddings'] @ embedding
+        same_document = np.array([key == document_key for key in cache['document_keys']])
+        similarities = np.where(same_document, similarities, -1.0)
+        
+        best = int(np.argmax(similarities))
+        if similarities[best] > SEMANTIC_CACHE_THRESHOLD:
+            return cache['presentations'][best]
+        return None
+
+    def _semantic_cache_store(self, embedding: Optional[np.ndarray], document_key: str,
+                              presentation: PresentationData):
+        """Remember a generated presentation under its topic embedding"""
+        if embedding is None:
+            return
+        
+        cache = st.session_state.setdefault('_semantic_cache', {
+            'embeddings': np.empty((0, embedding.shape[0]), dtype=np.float32),
+            'document_keys': [],
+            'presentations': []
+        })
+        cache['embeddings'] = np.vstack([cache['embeddings'], embedding])
+        cache['document_keys'].append(document_key)
+        cache['presentations'].append(presentation)
+
     def _generate_fallback_content(self, topic: str) -> PresentationData:
         """Generate enhanced fallback content when AI fails"""
         slides = [
@@ -308,12 +496,27 @@ Output Format - Respond ONLY with valid JSON in this exact structure:
 # ENHANCED PDF GENERATION MODULE
 # ============================================================================
 
+# via.placeholder.com/<width>[x<height>][/<background>[/<foreground>]]
+_PLACEHOLDER_RE = re.compile(
+    r"via\.placeholder\.com/(\d+)(?:x(\d+))?"
+    r"(?:/([0-9a-fA-F]{6}|[0-9a-fA-F]{3})\b)?(?:/([0-9a-fA-F]{6}|[0-9a-fA-F]{3})\b)?"
+)
+
+@dataclass
+class _PendingImage:
+    """Story placeholder for an image that is still downloading"""
+    future: Future
+    width: float
+    height: float
+    space_after: float = 0
+
 class EnhancedPDFGenerator:
     """Generate enhanced PDF presentations with images and rich content"""
     
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self.session = self._create_session()
         
     def _setup_custom_styles(self):
         """Setup custom styles for enhanced PDF"""
@@ -367,22 +570,122 @@ class EnhancedPDFGenerator:
             leftIndent=10
         ))
         
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Create a pooled keep-alive session shared by the image download workers"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+        
     def download_image(self, url: str) -> Optional[str]:
         """Download image from URL and return local path"""
         try:
-            response = requests.get(url, stream=True, timeout=10)
-            response.raise_for_status()
+            # Placeholder images are plain coloured boxes with a caption, so draw them locally
+            image_path = self._render_placeholder(url) if "via.placeholder.com" in url else None
+            
+            if image_path is None:
+                response = self.session.get(url, stream=True, timeout=10)
+                response.raise_for_status()
+                
+                # Create temporary file
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
+                    self._write_response(response, tmp_file)
+                image_path = tmp_file.name
             
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    tmp_file.write(chunk)
-                return tmp_file.name
+            return image_path
         except Exception as e:
             print(f"Error downloading image {url}: {e}")
             return None
+
+    @staticmethod
+    def _render_placeholder(url: str) -> Optional[str]:
+        """Render a via.placeholder.com image to a temp JPEG, or None if the URL is not understood"""
+        match = _PLACEHOLDER_RE.search(url)
+        if not match:
+            return None
+        
+        # Sizes come from LLM output, so clamp them before allocating the image
+        width = min(max(int(match.group(1)), 1), PLACEHOLDER_MAX_SIDE)
+        height = min(max(int(match.group(2) or match.group(1)), 1), PLACEHOLDER_MAX_SIDE)
+        background = f"#{match.group(3) or 'cccccc'}"
+        foreground = f"#{match.group(4) or '969696'}"
+        text = parse_qs(urlparse(url).query).get('text', [f"{width} x {height}"])[0]
+        
+        image = PILImage.new("RGB", (width, height), background)
+        draw = ImageDraw.Draw(image)
+        try:
+            font = ImageFont.load_default(size=max(12, height // 12))
+        except TypeError:  # Pillow < 10.1 only has the fixed-size bitmap font
+            font = ImageFont.load_default()
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        position = ((width - (right - left)) / 2 - left, (height - (bottom - top)) / 2 - top)
+        draw.text(position, text, fill=foreground, font=font)
+        
+        # JPEG lets reportlab embed the file directly without decoding it
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
+            image.save(tmp_file, format="JPEG", quality=90)
+        return tmp_file.name
+
+    @staticmethod
+    def _write_response(response: requests.Response, tmp_file):
+        """Write a response body in one call, streaming only large or unknown-size bodies"""
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) <= IMAGE_STREAM_THRESHOLD:
+            tmp_file.write(response.content)
+        else:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                tmp_file.write(chunk)
+
+    def _submit_image_downloads(self, executor: ThreadPoolExecutor, slides: List[SlideContent],
+                                futures: Dict[str, Future]) -> List[List[Future]]:
+        """Start downloading all slide images, returning each slide's futures in display order"""
+        slide_futures = []
+        for slide_idx, slide_content in enumerate(slides):
+            limit = 1 if slide_idx == 0 else 2  # Title slide shows 1 image, content slides up to 2
+            current = []
+            for url in slide_content.image_urls[:limit]:
+                # Each distinct URL is fetched once per build; repeats share the same future
+                if url not in futures:
+                    futures[url] = executor.submit(self.download_image, url)
+                current.append(futures[url])
+            slide_futures.append(current)
+        return slide_futures
+
+    @staticmethod
+    def _resolve_pending_images(story: List) -> List:
+        """Replace image placeholders with Image flowables once their downloads complete"""
+        resolved = []
+        readers: Dict[str, ImageReader] = {}
+        for item in story:
+            if not isinstance(item, _PendingImage):
+                resolved.append(item)
+                continue
+            
+            image_path = item.future.result()
+            if not image_path:
+                continue
+            # A fresh flowable per position (platypus keeps layout state on each flowable), but one
+            # decoded reader per file so a non-JPEG image repeated across slides is decoded once
+            try:
+                image = Image(image_path, width=item.width, height=item.height)
+                if '_img' not in image.__dict__:
+                    if image_path not in readers:
+                        readers[image_path] = ImageReader(image_path)
+                    image._img = readers[image_path]
+                resolved.append(image)
+                if item.space_after:
+                    resolved.append(Spacer(1, item.space_after))
+            except:
+                pass
+        return resolved
     
-    def create_presentation(self, presentation_data: PresentationData) -> io.BytesIO:
+    def create_presentation(self, presentation_data: PresentationData) -> bytes:
         """Create enhanced PDF presentation"""
         
         pdf_buffer = io.BytesIO()
@@ -397,24 +700,43 @@ class EnhancedPDFGenerator:
         )
         
         story = []
+        downloads: Dict[str, Future] = {}  # Per build, as the generator is shared across sessions
         
-        # Generate enhanced slides
-        for i, slide_content in enumerate(presentation_data.slides):
-            if i == 0:
-                story.extend(self._create_enhanced_title_slide(slide_content, presentation_data))
-            else:
-                story.extend(self._create_enhanced_content_slide(slide_content, i))
+        try:
+            slides = presentation_data.slides
+            last_index = len(slides) - 1
             
-            if i < len(presentation_data.slides) - 1:
-                story.append(PageBreak())
-        
-        # Build PDF
-        doc.build(story)
-        pdf_buffer.seek(0)
-        
-        return pdf_buffer
+            # Images download on worker threads while this thread builds the text flowables
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                image_futures = self._submit_image_downloads(executor, slides, downloads)
+                
+                # Generate enhanced slides
+                for i, slide_content in enumerate(slides):
+                    if i == 0:
+                        story.extend(self._create_enhanced_title_slide(slide_content, presentation_data, image_futures[i]))
+                    else:
+                        story.extend(self._create_enhanced_content_slide(slide_content, i, image_futures[i]))
+                    
+                    if i < last_index:
+                        story.append(PageBreak())
+                
+                story = self._resolve_pending_images(story)
+            
+            # Build PDF
+            doc.build(story)
+        finally:
+            # Images are read during build, so temp files are removed only afterwards;
+            # the executor has shut down by now, so every download future is finished
+            for future in downloads.values():
+                path = future.result()
+                if path and os.path.exists(path):
+                    os.unlink(path)
+        
+        # Streamlit's download button stores bytes as-is, so this is the only copy of the PDF
+        return pdf_buffer.getvalue()
 
-    def _create_enhanced_title_slide(self, slide_content: SlideContent, presentation_data: PresentationData) -> List:
+    def _create_enhanced_title_slide(self, slide_content: SlideContent, presentation_data: PresentationData,
+                                     image_futures: List[Future]) -> List:
         """Create enhanced title slide"""
         content = []
         
@@ -427,8 +749,9 @@ class EnhancedPDFGenerator:
         
         # Subtitle points
         if slide_content.bullet_points:
+            bullet_style = self.styles['BulletPoint']
             for point in slide_content.bullet_points:
-                subtitle = Paragraph(f"• {point}", self.styles['BulletPoint'])
+                subtitle = Paragraph(f"• {point}", bullet_style)
                 content.append(subtitle)
         
         content.append(Spacer(1, 0.3*inch))
@@ -441,15 +764,8 @@ class EnhancedPDFGenerator:
         content.append(Spacer(1, 0.5*inch))
         
         # Add title image if available
-        if slide_content.image_urls:
-            image_path = self.download_image(slide_content.image_urls[0])
-            if image_path:
-                try:
-                    img = Image(image_path, width=3*inch, height=2*inch)
-                    content.append(img)
-                    os.unlink(image_path)  # Clean up temp file
-                except:
-                    pass
+        if image_futures:
+            content.append(_PendingImage(image_futures[0], width=3*inch, height=2*inch))
         
         # Timestamp
         timestamp = f"Generated: {presentation_data.generated_at.strftime('%B %d, %Y')}"
@@ -459,9 +775,12 @@ class EnhancedPDFGenerator:
         
         return content
 
-    def _create_enhanced_content_slide(self, slide_content: SlideContent, slide_number: int) -> List:
+    def _create_enhanced_content_slide(self, slide_content: SlideContent, slide_number: int,
+                                       image_futures: List[Future]) -> List:
         """Create enhanced content slide"""
         content = []
+        bullet_style = self.styles['BulletPoint']
+        url_style = self.styles['URLStyle']
         
         content.append(Spacer(1, 0.3*inch))
         
@@ -473,7 +792,7 @@ class EnhancedPDFGenerator:
         # Bullet points
         for bullet_point in slide_content.bullet_points:
             bullet_text = f"• {bullet_point}"
-            bullet = Paragraph(bullet_text, self.styles['BulletPoint'])
+            bullet = Paragraph(bullet_text, bullet_style)
             content.append(bullet)
         
         content.append(Spacer(1, 0.2*inch))
@@ -485,27 +804,18 @@ class EnhancedPDFGenerator:
             content.append(info_para)
             content.append(Spacer(1, 0.2*inch))
         
-        # Add images
-        if slide_content.image_urls:
-            for img_url in slide_content.image_urls[:2]:  # Limit to 2 images per slide
-                image_path = self.download_image(img_url)
-                if image_path:
-                    try:
-                        img = Image(image_path, width=2.5*inch, height=1.8*inch)
-                        content.append(img)
-                        content.append(Spacer(1, 0.1*inch))
-                        os.unlink(image_path)  # Clean up temp file
-                    except:
-                        pass
+        # Add images (already limited to 2 per slide by _submit_image_downloads)
+        for future in image_futures:
+            content.append(_PendingImage(future, width=2.5*inch, height=1.8*inch, space_after=0.1*inch))
         
         # Reference URLs
         if slide_content.reference_urls:
             content.append(Spacer(1, 0.1*inch))
-            ref_title = Paragraph("<b>References & Further Reading:</b>", self.styles['BulletPoint'])
+            ref_title = Paragraph("<b>References & Further Reading:</b>", bullet_style)
             content.append(ref_title)
             
             for url in slide_content.reference_urls:
-                url_para = Paragraph(f"• {url}", self.styles['URLStyle'])
+                url_para = Paragraph(f"• {url}", url_style)
                 content.append(url_para)
         
         return content
@@ -514,6 +824,21 @@ class EnhancedPDFGenerator:
 # STREAMLIT APPLICATION
 # ============================================================================
 
+@st.cache_resource
+def get_document_processor() -> DocumentProcessor:
+    """Share one document processor across reruns"""
+    return DocumentProcessor()
+
+@st.cache_resource
+def get_pdf_generator() -> EnhancedPDFGenerator:
+    """Share one PDF generator (styles and HTTP session) across reruns"""
+    return EnhancedPDFGenerator()
+
+@st.cache_resource(max_entries=16, ttl=3600)
+def get_ai_generator(api_key: str) -> AIContentGenerator:
+    """Build the AI generator once per API key instead of on every rerun; bounded so entered keys don't pile up"""
+    return AIContentGenerator(api_key)
+
 def main():
     """Main Streamlit application"""
     
@@ -532,9 +857,9 @@ def main():
         return
     
     # Initialize components
-    doc_processor = DocumentProcessor()
-    ai_generator = AIContentGenerator(api_key)
-    pdf_generator = EnhancedPDFGenerator()
+    doc_processor = get_document_processor()
+    ai_generator = get_ai_generator(api_key)
+    pdf_generator = get_pdf_generator()
     
     # Main interface
     st.header("📝 Create Your Presentation")
@@ -560,14 +885,15 @@ def main():
             placeholder="e.g., Document Analysis Summary"
         )
         
-        uploaded_file = st.file_uploader(
-            "Upload Document",
-            type=['pdf', 'docx', 'txt', 'csv']
+        uploaded_files = st.file_uploader(
+            "Upload Documents",
+            type=['pdf', 'docx', 'txt', 'csv'],
+            accept_multiple_files=True
         )
         
-        if uploaded_file:
-            with st.spinner("Processing document..."):
-                document_content = doc_processor.process_uploaded_file(uploaded_file)
+        if uploaded_files:
+            with st.spinner("Processing documents..."):
+                document_content = doc_processor.process_many(uploaded_files)
                 
             if document_content:
                 st.success(f"✅ Document processed! {len(document_content)} characters extracted")
@@ -622,11 +948,11 @@ def main():
         if st.button("📄 Generate PDF File", type="primary"):
             with st.spinner("Creating enhanced PDF..."):
                 try:
-                    pdf_buffer = pdf_generator.create_presentation(presentation_data)
+                    pdf_bytes = pdf_generator.create_presentation(presentation_data)
                     
                     st.download_button(
                         label="⬇️ Download Enhanced PDF",
-                        data=pdf_buffer.getvalue(),
+                        data=pdf_bytes,
                         file_name=f"{presentation_data.topic.replace(' ', '_')}_enhanced.pdf",
                         mime="application/pdf"
                     )